@@ -4,13 +4,70 @@ SLTP Performance Monitoring Dashboard
 Real-time tracking of SLTP effectiveness on live trades
 """
 
-import json
-import subprocess
+import hashlib
+import http.client
 import time
 from datetime import datetime
-from collections import defaultdict
 import sys
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+API_HOST = 'localhost'
+API_PORT = 8094
+
+BANNER_EQ = '=' * 100
+BANNER_DASH = '-' * 100
+
+# Static dashboard sections, built once at import
+TRACKED_METRICS_SECTION = "\n4. METRICS BEING TRACKED\n" + BANNER_DASH + "\n" + """
+For each trade, monitoring:
+  [*] Entry price & time
+  [*] Exit reason (SL hit, TP1, TP2, TP3, TP4 hit, timeout, manual)
+  [*] P&L amount & percentage
+  [*] Time in trade
+  [*] Trade mode (scalp/swing/position)
+  [*] SLTP effectiveness (did multi-TP help?)
+  [*] Trailing stop performance (if activated)
+
+Running totals:
+  [*] Win rate (expected: 50-55%)
+  [*] Average winning trade size
+  [*] Average losing trade size
+  [*] Consecutive wins/losses
+  [*] Daily P&L
+  [*] TP level hit distribution
+  [*] SL hit frequency
+"""
+
+MONITORING_PLAN_SECTION = "\n5. MONITORING PLAN\n" + BANNER_DASH + "\n" + """
+IMMEDIATE (Next 24 hours):
+  [ ] Monitor for first 5-10 trades
+  [ ] Validate SLTP orders are being placed correctly
+  [ ] Check trailing stop activation
+  
+SHORT TERM (Next 7 days):
+  [ ] Collect 20-30 trades
+  [ ] Calculate actual win rate (target: 50-55%)
+  [ ] Analyze TP level distribution
+  [ ] Compare risk/reward to baseline
+  [ ] Review whipsaw reduction
+
+ONGOING:
+  [ ] Daily P&L tracking
+  [ ] Mode-specific performance analysis
+  [ ] Adjust if win rate < 45% or RR ratio < 1:1.5
+  [ ] Optimize based on TP level hit patterns
+"""
+
+DASHBOARD_FOOTER = (
+    "\n" + BANNER_EQ + "\n"
+    "STATUS: MONITORING ACTIVE - No trades yet, awaiting new entries\n"
+    + BANNER_EQ + "\n"
+)
+
 class SLTPMonitor:
     def __init__(self):
         self.trades = []
@@ -22,18 +79,50 @@ class SLTPMonitor:
             'avg_loss': 25.0,
             'risk_reward': 1.0
         }
+        self._conn = None
+        self._responses = {}  # path -> last body digest, parsed body and cache validators
+    
+    def _api_get(self, path):
+        """GET a JSON endpoint over a persistent keep-alive connection"""
+        # Revalidate with the validators from the previous response, if any
+        cached = self._responses.get(path)
+        headers = {}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        elif cached and cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+        
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(API_HOST, API_PORT, timeout=5)
+            try:
+                self._conn.request('GET', path, headers=headers)
+                response = self._conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Server may have dropped the idle connection; reconnect once
+                self._conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+        
+        if response.status == 304 and cached:
+            return cached['data']
+        
+        # Without validators, an unchanged body still reuses the previous parse
+        digest = hashlib.blake2b(body, digest_size=8).digest()
+        if cached is None or cached['digest'] != digest:
+            cached = self._responses[path] = {'digest': digest, 'data': json_loads(body)}
+        cached['etag'] = response.getheader('ETag')
+        cached['last_modified'] = response.getheader('Last-Modified')
+        return cached['data']
     
     def fetch_data(self):
         """Fetch current market data"""
         try:
             # Get orders
-            result = subprocess.run([
-                'C:\Windows\System32\curl.exe', '-s', '--max-time', '5',
-                'http://localhost:8094/api/futures/orders/all'
-            ], capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                self.orders = json.loads(result.stdout)
+            self.orders = self._api_get('/api/futures/orders/all')
             
             return True
         except Exception as e:
@@ -41,128 +130,108 @@ class SLTPMonitor:
             return False
     
     def analyze_sltp_orders(self):
-        """Analyze SLTP orders by symbol"""
-        algo_orders = self.orders.get('algo_orders', [])
+        """Analyze SLTP orders by symbol
         
-        summary = defaultdict(lambda: {'sl': [], 'tp': [], 'tp_levels': 0})
+        Returns (sl_by_sym, tp_by_sym, tp_levels): per-symbol lists of
+        (trigger_price, qty) tuples for SL and TP orders, and TP level counts.
+        """
+        # Sorted by symbol so each symbol's orders are appended back to back
+        algo_orders = sorted(self.orders.get('algo_orders', []), key=lambda o: o.get('symbol') or '')
+        
+        sl_by_sym = {}
+        tp_by_sym = {}
+        tp_levels = {}
         
         for order in algo_orders:
             symbol = order.get('symbol')
-            order_type = order.get('orderType')
+            order_type = order.get('orderType', '')
             trigger_price = float(order.get('triggerPrice', 0))
             qty = float(order.get('quantity', 0))
             
             if 'STOP' in order_type:
-                summary[symbol]['sl'].append({'price': trigger_price, 'qty': qty})
+                sl_by_sym.setdefault(symbol, []).append((trigger_price, qty))
             elif 'TAKE_PROFIT' in order_type:
-                summary[symbol]['tp'].append({'price': trigger_price, 'qty': qty})
-                summary[symbol]['tp_levels'] += 1
+                tp_by_sym.setdefault(symbol, []).append((trigger_price, qty))
+                tp_levels[symbol] = tp_levels.get(symbol, 0) + 1
         
-        return summary
+        return sl_by_sym, tp_by_sym, tp_levels
     
-    def calculate_metrics(self):
-        """Calculate performance metrics"""
-        return {
-            'active_orders': len(self.orders.get('algo_orders', [])),
-            'sl_orders': len([o for o in self.orders.get('algo_orders', []) if 'STOP' in o.get('orderType', '')]),
-            'tp_orders': len([o for o in self.orders.get('algo_orders', []) if 'TAKE_PROFIT' in o.get('orderType', '')]),
-        }
+    def calculate_metrics(self, summary=None):
+        """Calculate performance metrics, reusing an analyze_sltp_orders() result if given"""
+        orders = self.orders.get('algo_orders', [])
+        if summary is not None:
+            sl_by_sym, tp_by_sym, _ = summary
+            sl = sum(map(len, sl_by_sym.values()))
+            tp = sum(map(len, tp_by_sym.values()))
+        else:
+            sl = tp = 0
+            for o in orders:
+                t = o.get('orderType', '')
+                if 'STOP' in t:
+                    sl += 1
+                elif 'TAKE_PROFIT' in t:
+                    tp += 1
+        return {'active_orders': len(orders), 'sl_orders': sl, 'tp_orders': tp}
     
     def print_dashboard(self):
         """Print real-time monitoring dashboard"""
-        print("\n" + "="*100)
-        print("SLTP PERFORMANCE MONITORING DASHBOARD")
-        print("="*100)
-        print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        sys.stdout.write(
+            f"\n{BANNER_EQ}\nSLTP PERFORMANCE MONITORING DASHBOARD\n{BANNER_EQ}\n"
+            f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        )
         
         # Fetch latest data
         if not self.fetch_data():
             print("Error: Could not fetch live data")
             return
         
+        # Single pass over the orders feeds both sections below
+        summary = self.analyze_sltp_orders()
+        
+        # The rest of the dashboard is buffered and written in one call
+        parts = []
+        
         # === SECTION 1: ORDERS STATUS ===
-        metrics = self.calculate_metrics()
-        print("1. LIVE SLTP ORDERS STATUS")
-        print("-"*100)
-        print(f"Total Orders: {metrics['active_orders']}")
-        print(f"  - Stop Loss Orders: {metrics['sl_orders']}")
-        print(f"  - Take Profit Orders: {metrics['tp_orders']}")
-        print(f"  - Multi-TP Positions: {metrics['tp_orders'] // max(metrics['sl_orders'], 1)} levels avg")
+        metrics = self.calculate_metrics(summary)
+        parts.append("1. LIVE SLTP ORDERS STATUS")
+        parts.append(BANNER_DASH)
+        parts.append(f"Total Orders: {metrics['active_orders']}")
+        parts.append(f"  - Stop Loss Orders: {metrics['sl_orders']}")
+        parts.append(f"  - Take Profit Orders: {metrics['tp_orders']}")
+        parts.append(f"  - Multi-TP Positions: {metrics['tp_orders'] // max(metrics['sl_orders'], 1)} levels avg")
         
         # === SECTION 2: SYMBOL BREAKDOWN ===
-        print("\n2. ORDERS BY SYMBOL")
-        print("-"*100)
+        parts.append("\n2. ORDERS BY SYMBOL")
+        parts.append(BANNER_DASH)
         
-        summary = self.analyze_sltp_orders()
-        print(f"{'Symbol':<12} {'SL Orders':<12} {'TP Orders':<12} {'TP Levels':<15} {'Status':<15}")
-        print("-"*100)
+        parts.append(f"{'Symbol':<12} {'SL Orders':<12} {'TP Orders':<12} {'TP Levels':<15} {'Status':<15}")
+        parts.append(BANNER_DASH)
         
-        for symbol in sorted(summary.keys()):
-            data = summary[symbol]
-            sl_count = len(data['sl'])
-            tp_count = len(data['tp'])
+        sl_by_sym, tp_by_sym, tp_levels = summary
+        for symbol in sorted(sl_by_sym.keys() | tp_by_sym.keys()):
+            sl_count = len(sl_by_sym.get(symbol, ()))
+            tp_count = len(tp_by_sym.get(symbol, ()))
             
             status = "HEALTHY" if (sl_count > 0 and tp_count > 0) else "PENDING"
             
-            print(f"{symbol:<12} {sl_count:<12} {tp_count:<12} {data['tp_levels']:<15} {status:<15}")
+            parts.append(f"{symbol:<12} {sl_count:<12} {tp_count:<12} {tp_levels.get(symbol, 0):<15} {status:<15}")
         
         # === SECTION 3: EXPECTED RESULTS ===
-        print("\n3. EXPECTED PERFORMANCE IMPROVEMENTS")
-        print("-"*100)
-        print(f"Win Rate: {self.baseline['win_rate']}% baseline -> 50-55% expected (+10%)")
-        print(f"Avg Win: ${self.baseline['avg_win']} baseline -> $50-100 expected (+75%)")
-        print(f"Avg Loss: ${self.baseline['avg_loss']} baseline -> $25-50 expected (controlled)")
-        print(f"Risk/Reward: 1:0.8-1.3 baseline -> 1:2.0 expected (+150%)")
+        parts.append("\n3. EXPECTED PERFORMANCE IMPROVEMENTS")
+        parts.append(BANNER_DASH)
+        parts.append(f"Win Rate: {self.baseline['win_rate']}% baseline -> 50-55% expected (+10%)")
+        parts.append(f"Avg Win: ${self.baseline['avg_win']} baseline -> $50-100 expected (+75%)")
+        parts.append(f"Avg Loss: ${self.baseline['avg_loss']} baseline -> $25-50 expected (controlled)")
+        parts.append("Risk/Reward: 1:0.8-1.3 baseline -> 1:2.0 expected (+150%)")
         
         # === SECTION 4: TRACKING METRICS ===
-        print("\n4. METRICS BEING TRACKED")
-        print("-"*100)
-        print("""
-For each trade, monitoring:
-  [*] Entry price & time
-  [*] Exit reason (SL hit, TP1, TP2, TP3, TP4 hit, timeout, manual)
-  [*] P&L amount & percentage
-  [*] Time in trade
-  [*] Trade mode (scalp/swing/position)
-  [*] SLTP effectiveness (did multi-TP help?)
-  [*] Trailing stop performance (if activated)
-
-Running totals:
-  [*] Win rate (expected: 50-55%)
-  [*] Average winning trade size
-  [*] Average losing trade size
-  [*] Consecutive wins/losses
-  [*] Daily P&L
-  [*] TP level hit distribution
-  [*] SL hit frequency
-""")
+        parts.append(TRACKED_METRICS_SECTION)
         
         # === SECTION 5: NEXT ACTIONS ===
-        print("\n5. MONITORING PLAN")
-        print("-"*100)
-        print("""
-IMMEDIATE (Next 24 hours):
-  [ ] Monitor for first 5-10 trades
-  [ ] Validate SLTP orders are being placed correctly
-  [ ] Check trailing stop activation
-  
-SHORT TERM (Next 7 days):
-  [ ] Collect 20-30 trades
-  [ ] Calculate actual win rate (target: 50-55%)
-  [ ] Analyze TP level distribution
-  [ ] Compare risk/reward to baseline
-  [ ] Review whipsaw reduction
-
-ONGOING:
-  [ ] Daily P&L tracking
-  [ ] Mode-specific performance analysis
-  [ ] Adjust if win rate < 45% or RR ratio < 1:1.5
-  [ ] Optimize based on TP level hit patterns
-""")
+        parts.append(MONITORING_PLAN_SECTION)
         
-        print("\n" + "="*100)
-        print("STATUS: MONITORING ACTIVE - No trades yet, awaiting new entries")
-        print("="*100 + "\n")
+        parts.append(DASHBOARD_FOOTER)
+        sys.stdout.write('\n'.join(parts) + '\n')
 
 def main():
     monitor = SLTPMonitor()
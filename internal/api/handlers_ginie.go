@@ -781,10 +781,21 @@ func (s *Server) handleGetGinieAutopilotPositions(c *gin.Context) {
 
 	positions := autopilot.GetPositions()
 
-	c.JSON(http.StatusOK, gin.H{
+	// GetPositions ranges over a map; a fixed order keeps the body, and so its ETag, stable
+	sort.Slice(positions, func(i, j int) bool {
+		return positions[i].Symbol < positions[j].Symbol
+	})
+
+	body, err := json.Marshal(gin.H{
 		"positions": positions,
 		"count":     len(positions),
 	})
+	if err != nil {
+		errorResponse(c, http.StatusInternalServerError, "Failed to encode positions")
+		return
+	}
+
+	etagResponse(c, body)
 }
 
 // handleGetGinieAutopilotTradeHistory returns Ginie trade history
@@ -6,6 +6,8 @@ import (
 	"net/http/httptest"
 	"strings"
 	"testing"
+
+	"github.com/gin-gonic/gin"
 )
 
 func TestHealthEndpoint(t *testing.T) {
@@ -321,3 +323,43 @@ func TestBacktestEndpointValidation(t *testing.T) {
 		})
 	}
 }
+
+func TestETagResponse(t *testing.T) {
+	gin.SetMode(gin.TestMode)
+	router := gin.New()
+	router.GET("/api/futures/ginie/autopilot/positions", func(c *gin.Context) {
+		etagResponse(c, []byte(`{"count":1,"positions":[{"symbol":"BTCUSDT"}]}`))
+	})
+
+	get := func(ifNoneMatch string) *httptest.ResponseRecorder {
+		req := httptest.NewRequest(http.MethodGet, "/api/futures/ginie/autopilot/positions", nil)
+		if ifNoneMatch != "" {
+			req.Header.Set("If-None-Match", ifNoneMatch)
+		}
+		w := httptest.NewRecorder()
+		router.ServeHTTP(w, req)
+		return w
+	}
+
+	w := get("")
+	if w.Code != http.StatusOK {
+		t.Fatalf("Expected status 200, got %d", w.Code)
+	}
+	etag := w.Header().Get("ETag")
+	if etag == "" {
+		t.Fatal("Expected ETag header on 200 response")
+	}
+
+	w = get(etag)
+	if w.Code != http.StatusNotModified {
+		t.Errorf("Expected status 304 for matching If-None-Match, got %d", w.Code)
+	}
+	if w.Body.Len() != 0 {
+		t.Errorf("Expected empty body on 304, got '%s'", w.Body.String())
+	}
+
+	w = get(`W/"stale"`)
+	if w.Code != http.StatusOK {
+		t.Errorf("Expected status 200 for stale If-None-Match, got %d", w.Code)
+	}
+}
@@ -3,6 +3,7 @@ package api
 import (
 	"context"
 	"fmt"
+	"hash/fnv"
 	"log"
 	"net/http"
 	"os"
@@ -1028,6 +1029,21 @@ func successResponse(c *gin.Context, data interface{}) {
 	})
 }
 
+// etagResponse sends an encoded JSON body with a weak ETag (FNV-64a of the body).
+// Pollers that send the tag back in If-None-Match get a bodiless 304 while nothing changed.
+func etagResponse(c *gin.Context, body []byte) {
+	hash := fnv.New64a()
+	hash.Write(body)
+	etag := fmt.Sprintf(`W/"%016x"`, hash.Sum64())
+	c.Header("ETag", etag)
+	if c.GetHeader("If-None-Match") == etag {
+		c.Status(http.StatusNotModified)
+		return
+	}
+
+	c.Data(http.StatusOK, "application/json; charset=utf-8", body)
+}
+
 // getUserID returns the user ID from the context, or empty string if not authenticated
 func (s *Server) getUserID(c *gin.Context) string {
 	if !s.authEnabled {
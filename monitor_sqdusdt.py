@@ -4,15 +4,80 @@ SQDUSDT Position Monitoring Script
 Continuously monitors SQDUSDT until position closes via early profit booking
 """
 
-import subprocess
-import json
+import bisect
+import hashlib
+import http.client
+import os
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 THRESHOLDS = {'swing': 8.0}
 FEE_RATE = 0.0004
-CHECK_INTERVAL = 10  # seconds
 MAX_MONITORING_TIME = 3600  # 1 hour
+ROI_HISTORY_SIZE = 1024  # ROI samples kept for the final report
+ROI_REPORT_LINES = 50
+BANNER = '=' * 110
+
+# ROI progress bar: bucket boundaries and the bar shown for each bucket
+STATUS_BAR_LEVELS = [6.0, 7.0, 7.5, 8.0]
+STATUS_BARS = ('░░░░░░░░░░', '██░░░░░░░░', '████░░░░░░', '██████░░░░', '██████████')
+API_HOST = "localhost"
+API_PORT = 8094
+POSITIONS_PATH = "/api/futures/ginie/autopilot/positions"
+SERVER_LOG = "D:/Apps/binance-trading-bot/server.log"
+LOG_BLOCK_SIZE = 8192
+
+_conn = None
+_responses = {}  # path -> last body digest, parsed body and cache validators
+_pool = ThreadPoolExecutor(max_workers=2)
+
+# server.log is scanned incrementally: bytes before 'offset' have been searched already and
+# 'result' is the newest match found so far, reused while the log is unchanged (same mtime and size)
+_log_cache = {'mtime': 0, 'size': 0, 'offset': 0, 'result': None}
+
+def _api_get(path, timeout=10):
+    """GET a JSON endpoint over a persistent keep-alive connection"""
+    global _conn
+    # Revalidate with the validators from the previous response, if any
+    cached = _responses.get(path)
+    headers = {}
+    if cached and cached['etag']:
+        headers['If-None-Match'] = cached['etag']
+    elif cached and cached['last_modified']:
+        headers['If-Modified-Since'] = cached['last_modified']
+
+    for attempt in range(2):
+        if _conn is None:
+            _conn = http.client.HTTPConnection(API_HOST, API_PORT, timeout=timeout)
+        try:
+            _conn.request('GET', path, headers=headers)
+            response = _conn.getresponse()
+            body = response.read()
+            break
+        except (http.client.HTTPException, OSError):
+            # Server may have dropped the idle connection; reconnect once
+            _conn.close()
+            _conn = None
+            if attempt:
+                raise
+
+    if response.status == 304 and cached:
+        return cached['data']
+
+    # Without validators, an unchanged body still reuses the previous parse
+    digest = hashlib.blake2b(body, digest_size=8).digest()
+    if cached is None or cached['digest'] != digest:
+        cached = _responses[path] = {'digest': digest, 'data': json_loads(body)}
+    cached['etag'] = response.getheader('ETag')
+    cached['last_modified'] = response.getheader('Last-Modified')
+    return cached['data']
 
 def calculate_roi(entry, current, qty, side, leverage):
     """Calculate ROI with leverage"""
@@ -34,13 +99,7 @@ def calculate_roi(entry, current, qty, side, leverage):
 def get_positions():
     """Fetch positions from API"""
     try:
-        result = subprocess.run(
-            ['curl', '-s', 'http://localhost:8094/api/futures/ginie/autopilot/positions', '--max-time', '10'],
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
-        return json.loads(result.stdout)
+        return _api_get(POSITIONS_PATH)
     except Exception as e:
         print(f"Error fetching positions: {e}")
         return None
@@ -56,48 +115,95 @@ def find_sqdusdt_position(data):
             return pos
     return None
 
+def _scan_log(f, offset, block_size=LOG_BLOCK_SIZE):
+    """Search the complete lines of a binary file from offset on for 'sqdusdt.*booking profit'
+
+    Returns (offset just past the last complete line, newest matching line or None).
+    A trailing partial line is left for the next scan.
+    """
+    f.seek(offset)
+    match = None
+    partial = b''
+    while True:
+        block = f.read(block_size)
+        if not block:
+            break
+        offset += len(block)
+        lines = (partial + block).split(b'\n')
+        partial = lines.pop()  # may continue in the next block
+        for line in lines:
+            lower = line.lower()
+            idx = lower.find(b'sqdusdt')
+            if idx >= 0 and lower.find(b'booking profit', idx) >= 0:
+                match = line
+    return offset - len(partial), match
+
 def check_server_log():
     """Check if SQDUSDT closed in logs"""
     try:
-        result = subprocess.run(
-            ['grep', '-i', 'sqdusdt.*booking profit', 'D:/Apps/binance-trading-bot/server.log'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return result.stdout if result.stdout else None
+        st = os.stat(SERVER_LOG)
+        if st.st_mtime == _log_cache['mtime'] and st.st_size == _log_cache['size']:
+            return _log_cache['result']
+
+        # Log truncated or rotated: start over from the beginning of the new file
+        if st.st_size < _log_cache['offset']:
+            _log_cache.update(offset=0, result=None)
+
+        # Only bytes appended since the last scan are read
+        with open(SERVER_LOG, 'rb') as f:
+            offset, match = _scan_log(f, _log_cache['offset'])
+        if match is not None:
+            _log_cache['result'] = match.decode(errors='ignore').strip()
+
+        _log_cache.update(mtime=st.st_mtime, size=st.st_size, offset=offset)
+        return _log_cache['result']
     except:
         return None
 
+def poll_interval(gap):
+    """Seconds until the next check: slow while far below the ROI threshold, fast near it"""
+    return 30.0 if gap > 3 else 10.0 if gap > 1 else 3.0 if gap > 0.25 else 1.0
+
 def main():
-    print("=" * 110)
+    print(BANNER)
     print("SQDUSDT POSITION MONITORING")
     print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 110)
+    print(BANNER)
     print("")
     print("Monitoring SQDUSDT (LONG, SWING mode)")
     print("Target ROI: 8.0%")
-    print("Check Interval: 10 seconds")
+    print("Check Interval: adaptive, 30s down to 1s as ROI nears the threshold")
     print("")
 
-    start_time = datetime.now()
+    # Booking lines already in server.log belong to earlier trades; only count ones written from now on
+    try:
+        _log_cache['offset'] = os.path.getsize(SERVER_LOG)
+    except OSError:
+        pass
+
+    start_time = time.monotonic()
     check_count = 0
     last_roi = None
-    roi_progression = []
+    roi_progression = deque(maxlen=ROI_HISTORY_SIZE)
+    roi_samples = 0  # ROI values recorded, including those since dropped from roi_progression
     position_closed = False
 
     while True:
-        elapsed_time = datetime.now() - start_time
+        # Wall clock is read once per tick for display; elapsed time uses the monotonic clock
+        elapsed = time.monotonic() - start_time
+        timestamp = datetime.now().strftime('%H:%M:%S')
 
-        if elapsed_time.total_seconds() > MAX_MONITORING_TIME:
+        if elapsed > MAX_MONITORING_TIME:
             print(f"\n[TIME]  Monitoring time limit reached ({MAX_MONITORING_TIME}s)")
             break
 
         check_count += 1
-        timestamp = datetime.now().strftime('%H:%M:%S')
 
-        # Fetch positions
-        data = get_positions()
+        # Fetch positions and grep the log concurrently - both are I/O bound
+        pos_future = _pool.submit(get_positions)
+        log_future = _pool.submit(check_server_log)
+        data = pos_future.result()
+        booked_indicator = " | [BOOKED IN LOG]" if log_future.result() else ""
         sqdusdt_pos = find_sqdusdt_position(data)
 
         if not sqdusdt_pos:
@@ -119,12 +225,13 @@ def main():
 
         # Store ROI progression
         roi_progression.append({'time': timestamp, 'roi': roi})
+        roi_samples += 1
 
         # Check if threshold hit
         if roi >= threshold:
-            print(f"\n{'='*110}")
+            print(f"\n{BANNER}")
             print(f"[SUCCESS] ROI THRESHOLD HIT! ({roi:.2f}% >= {threshold}%)")
-            print(f"{'='*110}")
+            print(BANNER)
             print(f"Time: {timestamp}")
             print(f"SQDUSDT should close automatically within 5 seconds...")
             time.sleep(5)
@@ -142,35 +249,25 @@ def main():
             else:
                 roi_change = " (→)"
 
-        status_bar = ""
-        if roi < 6.0:
-            status_bar = "░░░░░░░░░░"
-        elif roi < 7.0:
-            status_bar = "██░░░░░░░░"
-        elif roi < 7.5:
-            status_bar = "████░░░░░░"
-        elif roi < 8.0:
-            status_bar = "██████░░░░"
-        else:
-            status_bar = "██████████"
+        status_bar = STATUS_BARS[bisect.bisect_right(STATUS_BAR_LEVELS, roi)]
 
-        print(f"[{timestamp}] ROI: {roi:6.2f}% {roi_change} | Gap: {gap:5.2f}% | {status_bar} | Elapsed: {int(elapsed_time.total_seconds())}s")
+        print(f"[{timestamp}] ROI: {roi:6.2f}% {roi_change} | Gap: {gap:5.2f}% | {status_bar} | Elapsed: {int(elapsed)}s{booked_indicator}")
 
         last_roi = roi
-        time.sleep(CHECK_INTERVAL)
+        time.sleep(poll_interval(gap))
 
     # Final report
-    print(f"\n{'='*110}")
+    print(f"\n{BANNER}")
     print("MONITORING SESSION COMPLETE")
-    print(f"{'='*110}")
+    print(BANNER)
 
     if position_closed:
         print("\n[OK] POSITION CLOSED!")
         print(f"   Final ROI achieved: {last_roi:.2f}%")
-        print(f"   Total monitoring time: {int((datetime.now() - start_time).total_seconds())}s")
+        print(f"   Total monitoring time: {int(time.monotonic() - start_time)}s")
         print(f"   Checks performed: {check_count}")
 
-        # Check server log for confirmation
+        # Check server log for confirmation (cached unless the log changed since the last tick)
         log_entry = check_server_log()
         if log_entry:
             print("\n[OK] Confirmed in server.log:")
@@ -183,15 +280,18 @@ def main():
             print(f"   Last ROI: {last_roi:.2f}%")
             print(f"   Still need: {threshold - last_roi:.2f}% more")
 
-    print(f"\n{'='*110}")
+    print(f"\n{BANNER}")
 
     # ROI Progression Summary
     if roi_progression:
-        print("\nROI Progression:")
-        for entry in roi_progression:
+        recent = list(roi_progression)[-ROI_REPORT_LINES:]
+        rois = [entry['roi'] for entry in roi_progression]
+        print(f"\nROI Progression (last {len(recent)} of {roi_samples} samples):")
+        for entry in recent:
             print(f"  {entry['time']}: {entry['roi']:.2f}%")
+        print(f"  Min: {min(rois):.2f}% | Max: {max(rois):.2f}% (last {len(rois)} of {roi_samples} samples)")
 
-    print(f"\n{'='*110}\n")
+    print(f"\n{BANNER}\n")
 
 if __name__ == "__main__":
     try:
@@ -4,28 +4,87 @@ SQDUSDT Live Monitoring Script
 Monitors position closure with real-time ROI tracking and log analysis
 """
 
-import subprocess
-import json
+import hashlib
+import http.client
+import itertools
+import os
+import re
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import sys
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 THRESHOLD = 8.0
 FEE_RATE = 0.0004
-CHECK_INTERVAL = 5  # seconds
-API_URL = "http://localhost:8094/api/futures/ginie/autopilot/positions"
+CHECK_INTERVAL = 5  # seconds, retry delay after a failed check
+ROI_HISTORY_SIZE = 1024  # ROI samples kept for the stop summary
+BANNER = '=' * 100
+API_HOST = "localhost"
+API_PORT = 8094
+POSITIONS_PATH = "/api/futures/ginie/autopilot/positions"
 LOG_FILE = "D:\\Apps\\binance-trading-bot\\server.log"
+LOG_SCAN_LINES = 500  # most recent server.log lines searched per check
+LOG_BLOCK_SIZE = 8192
+
+# Log lines are matched as raw bytes; the symbol test rejects almost every line cheaply
+SYMBOL = b'SQDUSDT'
+FULL_CLOSE_PATTERN = re.compile(rb'full close order placed', re.IGNORECASE)
+CLOSING_MESSAGE = b'Ginie closing position'
+
+_conn = None
+_responses = {}  # path -> last body digest, parsed body and cache validators
+_pool = ThreadPoolExecutor(max_workers=2)
+
+# Last scan result, reused while server.log is unchanged (same mtime and size)
+_log_cache = {'mtime': 0, 'size': 0, 'result': (False, None), 'line': None, 'data': None}
+
+def _api_get(path, timeout=10):
+    """GET a JSON endpoint over a persistent keep-alive connection"""
+    global _conn
+    # Revalidate with the validators from the previous response, if any
+    cached = _responses.get(path)
+    headers = {}
+    if cached and cached['etag']:
+        headers['If-None-Match'] = cached['etag']
+    elif cached and cached['last_modified']:
+        headers['If-Modified-Since'] = cached['last_modified']
+
+    for attempt in range(2):
+        if _conn is None:
+            _conn = http.client.HTTPConnection(API_HOST, API_PORT, timeout=timeout)
+        try:
+            _conn.request('GET', path, headers=headers)
+            response = _conn.getresponse()
+            body = response.read()
+            break
+        except (http.client.HTTPException, OSError):
+            # Server may have dropped the idle connection; reconnect once
+            _conn.close()
+            _conn = None
+            if attempt:
+                raise
+
+    if response.status == 304 and cached:
+        return cached['data']
+
+    # Without validators, an unchanged body still reuses the previous parse
+    digest = hashlib.blake2b(body, digest_size=8).digest()
+    if cached is None or cached['digest'] != digest:
+        cached = _responses[path] = {'digest': digest, 'data': json_loads(body)}
+    cached['etag'] = response.getheader('ETag')
+    cached['last_modified'] = response.getheader('Last-Modified')
+    return cached['data']
 
 def get_positions():
     """Fetch positions from API"""
     try:
-        result = subprocess.run(
-            ['curl', '-s', '--max-time', '10', API_URL],
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
-        return json.loads(result.stdout)
+        return _api_get(POSITIONS_PATH)
     except Exception as e:
         print(f"[ERROR] Failed to fetch positions: {e}")
         return None
@@ -47,71 +106,107 @@ def calculate_roi(entry, current, qty, side, leverage):
     roi = (net_pnl * float(leverage) / notional) * 100
     return roi
 
+def _parse_log_line(line):
+    """Parse a raw JSON log line, reusing the previous parse if the same line matches again"""
+    if line != _log_cache['line']:
+        _log_cache['data'] = json_loads(line)
+        _log_cache['line'] = line
+    return _log_cache['data']
+
 def check_logs_for_success():
     """Check server logs for close success message"""
     try:
-        with open(LOG_FILE, 'r', errors='ignore') as f:
-            lines = f.readlines()
-
-        # Look for the most recent full close success for SQDUSDT
-        for line in reversed(lines[-500:]):
-            if 'full close order placed' in line.lower() and 'SQDUSDT' in line:
-                try:
-                    data = json.loads(line)
-                    if data.get('fields', {}).get('symbol') == 'SQDUSDT':
-                        return True, data
-                except:
-                    pass
-
-            # Also check for successful close in Ginie closing message
-            if 'Ginie closing position' in line and 'SQDUSDT' in line:
-                try:
-                    data = json.loads(line)
-                    if data.get('fields', {}).get('symbol') == 'SQDUSDT':
-                        return 'closing', data
-                except:
-                    pass
+        st = os.stat(LOG_FILE)
+        if st.st_mtime == _log_cache['mtime'] and st.st_size == _log_cache['size']:
+            return _log_cache['result']
 
-        return False, None
+        with open(LOG_FILE, 'rb') as f:
+            recent = itertools.islice(_iter_lines_reversed(f), LOG_SCAN_LINES)
+            result = _scan_log_lines(recent)
+        _log_cache.update(mtime=st.st_mtime, size=st.st_size, result=result)
+        return result
     except Exception as e:
         print(f"[ERROR] Failed to check logs: {e}")
         return False, None
 
+def _iter_lines_reversed(f, block_size=LOG_BLOCK_SIZE):
+    """Yield the lines of a binary file from last to first, reading backwards in blocks"""
+    pos = f.seek(0, os.SEEK_END)
+    partial = b''
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + partial).split(b'\n')
+        partial = lines.pop(0)  # may continue in the previous block
+        for line in reversed(lines):
+            if line:
+                yield line
+    if partial:
+        yield partial
+
+def _scan_log_lines(lines):
+    """Find the most recent SQDUSDT close message in raw log lines given newest first"""
+    for line in lines:
+        if SYMBOL not in line:
+            continue
+
+        # A full close success outranks the Ginie closing message
+        if FULL_CLOSE_PATTERN.search(line):
+            status = True
+        elif CLOSING_MESSAGE in line:
+            status = 'closing'
+        else:
+            continue
+
+        # Only structured (JSON) log lines carry the symbol field
+        if not line.startswith(b'{'):
+            continue
+
+        try:
+            data = _parse_log_line(line)
+            if data.get('fields', {}).get('symbol') == 'SQDUSDT':
+                return status, data
+        except Exception:
+            pass
+
+    return False, None
+
+# Progress bars for ROI buckets <2, <4, <6, <8 and >=8
+_BARS = ('░' * 10, '██' + '░' * 8, '████' + '░' * 6, '██████' + '░' * 4, '██████████')
+
 def print_status_bar(roi):
     """Print visual ROI progress bar"""
-    if roi < 2:
-        return "░░░░░░░░░░"
-    elif roi < 4:
-        return "██░░░░░░░░"
-    elif roi < 6:
-        return "████░░░░░░"
-    elif roi < 8:
-        return "██████░░░░"
-    else:
-        return "██████████"
+    return _BARS[min(4, max(0, int(roi) // 2))]
+
+def poll_interval(gap):
+    """Seconds until the next check: slow while far below the ROI threshold, fast near it"""
+    return 30.0 if gap > 3 else 10.0 if gap > 1 else 3.0 if gap > 0.25 else 1.0
 
 def main():
-    print("\n" + "="*100)
+    print("\n" + BANNER)
     print("SQDUSDT EARLY PROFIT BOOKING MONITOR")
-    print("="*100)
+    print(BANNER)
     print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Target Threshold: {THRESHOLD}% ROI")
-    print(f"Check Interval: {CHECK_INTERVAL} seconds")
-    print("="*100 + "\n")
+    print("Check Interval: adaptive, 30s down to 1s as ROI nears the threshold")
+    print(BANNER + "\n")
 
-    start_time = datetime.now()
     check_count = 0
     last_roi = None
-    roi_history = []
+    roi_history = deque(maxlen=ROI_HISTORY_SIZE)
 
     while True:
         try:
-            elapsed = datetime.now() - start_time
             check_count += 1
             timestamp = datetime.now().strftime('%H:%M:%S')
 
-            # Fetch position data
-            data = get_positions()
+            # Fetch position data and scan the log concurrently - both are I/O bound
+            pos_future = _pool.submit(get_positions)
+            log_future = _pool.submit(check_logs_for_success)
+            data = pos_future.result()
+            close_status, log_data = log_future.result()
+
             if not data:
                 print(f"[{timestamp}] [ERROR] Failed to fetch position data")
                 time.sleep(CHECK_INTERVAL)
@@ -128,9 +223,8 @@ def main():
             if not sqdusdt_pos:
                 print(f"[{timestamp}] [CLOSED] SQDUSDT position not found - position may have been closed!")
 
-                # Check logs for confirmation
-                success, log_data = check_logs_for_success()
-                if success:
+                # Confirm the close from this tick's log scan
+                if close_status:
                     try:
                         fields = log_data.get('fields', {})
                         print(f"\n[SUCCESS] Position closed successfully!")
@@ -141,9 +235,9 @@ def main():
                     except:
                         pass
 
-                print("\n" + "="*100)
+                print("\n" + BANNER)
                 print(f"Monitoring completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                print("="*100 + "\n")
+                print(BANNER + "\n")
                 break
 
             # Calculate ROI
@@ -157,7 +251,6 @@ def main():
             roi_history.append(roi)
 
             # Check for close in progress
-            close_status, _ = check_logs_for_success()
             close_indicator = ""
             if close_status == 'closing':
                 close_indicator = " [CLOSING...]"
@@ -178,12 +271,14 @@ def main():
                 print(f"[{timestamp}] ROI: {roi:6.2f}% {status_bar} | Gap: {gap:5.2f}% | Progress: {progress:3.0f}%")
 
             last_roi = roi
-            time.sleep(CHECK_INTERVAL)
+            time.sleep(poll_interval(gap))
 
         except KeyboardInterrupt:
             print(f"\n\n[STOPPED] Monitoring stopped by user")
             if roi_history:
-                print(f"[INFO] ROI progression: {[f'{r:.2f}%' for r in roi_history[:10]]}")
+                recent = list(roi_history)[-10:]
+                print(f"[INFO] ROI progression (last {len(recent)}): {[f'{r:.2f}%' for r in recent]}")
+                print(f"[INFO] ROI min/max over last {len(roi_history)} checks: {min(roi_history):.2f}% / {max(roi_history):.2f}%")
             break
         except Exception as e:
             print(f"[{timestamp}] [ERROR] {e}")
@@ -4,41 +4,99 @@ ROI Monitoring Script for Ginie Autopilot Positions
 Tracks positions and monitors for ROI-based early profit booking
 """
 
-import subprocess
-import json
+import http.client
 import sys
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # calculate_roi falls back to a per-position loop
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 THRESHOLDS = {'ultra_fast': 3.0, 'scalp': 5.0, 'swing': 8.0, 'position': 10.0}
 FEE_RATE = 0.0004
+API_HOST = "localhost"
+API_PORT = 8094
+POSITIONS_PATH = "/api/futures/ginie/autopilot/positions"
+NUMBA_MIN_POSITIONS = 256  # below this, numba's import and JIT time outweighs the arithmetic it saves
+
+_conn = None
+
+def _api_get(path, timeout=10):
+    """GET a JSON endpoint over a persistent keep-alive connection"""
+    global _conn
+    for attempt in range(2):
+        if _conn is None:
+            _conn = http.client.HTTPConnection(API_HOST, API_PORT, timeout=timeout)
+        try:
+            _conn.request('GET', path)
+            return json_loads(_conn.getresponse().read())
+        except (http.client.HTTPException, OSError):
+            # Server may have dropped the idle connection; reconnect once
+            _conn.close()
+            _conn = None
+            if attempt:
+                raise
+
+def roi_batch(entry, current, qty, side_sign, lev, fee):
+    """Leveraged ROI and net PnL arrays; both 0 where notional <= 0"""
+    gross_pnl = side_sign * (current - entry) * qty
+    notional = qty * entry
+    net_pnl = gross_pnl - (notional + current * qty) * fee
 
-def calculate_roi(entry, current, qty, side, leverage):
-    """Calculate ROI with leverage consideration"""
-    if side == "LONG":
-        gross_pnl = (current - entry) * qty
-    else:
-        gross_pnl = (entry - current) * qty
+    valid = notional > 0
+    safe_notional = np.where(valid, notional, 1.0)
+    roi = np.where(valid, net_pnl * lev / safe_notional * 100, 0.0)
+    return roi, np.where(valid, net_pnl, 0.0)
+
+def _roi_scalar(p):
+    """Leveraged ROI and net PnL for one position; both 0 where notional <= 0"""
+    entry = p['entry_price']
+    current = p['highest_price']
+    qty = p['remaining_qty']
+    side_sign = 1.0 if p['side'] == "LONG" else -1.0
 
+    gross_pnl = side_sign * (current - entry) * qty
     notional = qty * entry
-    fees = (notional * FEE_RATE) + (current * qty * FEE_RATE)
-    net_pnl = gross_pnl - fees
+    net_pnl = gross_pnl - (notional + current * qty) * FEE_RATE
 
     if notional <= 0:
-        return 0, 0
-
-    roi = (net_pnl * leverage / notional) * 100
-    return roi, net_pnl
+        return 0.0, 0.0
+    return net_pnl * p['leverage'] / notional * 100, net_pnl
+
+def calculate_roi(positions):
+    """Calculate ROI with leverage consideration for all positions as (roi, net_pnl) lists"""
+    if np is None:
+        results = [_roi_scalar(p) for p in positions]
+        return [roi for roi, _ in results], [net_pnl for _, net_pnl in results]
+
+    n = len(positions)
+    entry = np.fromiter((p['entry_price'] for p in positions), float, n)
+    current = np.fromiter((p['highest_price'] for p in positions), float, n)
+    qty = np.fromiter((p['remaining_qty'] for p in positions), float, n)
+    lev = np.fromiter((p['leverage'] for p in positions), float, n)
+    side_sign = np.fromiter((1.0 if p['side'] == "LONG" else -1.0 for p in positions), float, n)
+
+    kernel = roi_batch
+    if n >= NUMBA_MIN_POSITIONS:
+        try:
+            from numba import njit
+            kernel = njit(cache=True, fastmath=True)(roi_batch)
+        except ImportError:
+            pass
+
+    roi, net_pnl = kernel(entry, current, qty, side_sign, lev, FEE_RATE)
+    return roi.tolist(), net_pnl.tolist()
 
 def get_positions():
     """Fetch positions from API"""
     try:
-        result = subprocess.run(
-            ['curl', '-s', 'http://localhost:8094/api/futures/ginie/autopilot/positions', '--max-time', '10'],
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
-        return json.loads(result.stdout)
+        return _api_get(POSITIONS_PATH)
     except Exception as e:
         print(f"Error fetching positions: {e}")
         return None
@@ -62,26 +120,21 @@ def main():
     print(f"{'Symbol':<15} {'Side':<6} {'Mode':<10} {'Lev':<3} {'Entry Price':<18} {'Current':<18} {'ROI%':<10} {'Threshold%':<12} {'Status':<25}")
     print("-" * 140)
 
+    rois, _ = calculate_roi(positions)
+    thresholds = [THRESHOLDS.get(p['mode'], 8.0) for p in positions]
+
     threshold_hits = []
-    total_roi = 0
-    positive_count = 0
+    total_roi = sum(rois)
+    positive_count = sum(roi > 0 for roi in rois)
 
-    for pos in positions:
+    for pos, roi, threshold in zip(positions, rois, thresholds):
         symbol = pos['symbol']
         entry = pos['entry_price']
         current = pos['highest_price']
-        qty = pos['remaining_qty']
         side = pos['side']
         leverage = pos['leverage']
         mode = pos['mode']
 
-        roi, net_pnl = calculate_roi(entry, current, qty, side, leverage)
-        threshold = THRESHOLDS.get(mode, 8.0)
-
-        total_roi += roi
-        if roi > 0:
-            positive_count += 1
-
         if roi >= threshold:
             status = f"✓ THRESHOLD HIT ({roi - threshold:.1f}% above)"
             threshold_hits.append({
@@ -1,16 +1,49 @@
 #!/usr/bin/env python3
 
-import urllib.request
-import json
+import gzip
+import http.client
 from datetime import datetime
 import sys
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+API_HOST = 'localhost'
+API_PORT = 8094
+STATUS_PATH = '/api/futures/ginie/autopilot/status'
+REQUEST_HEADERS = {'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'}
+
+_conn = None
+
+def _api_get(path, timeout=5):
+    """GET a JSON endpoint over a persistent keep-alive connection, accepting gzip"""
+    global _conn
+    for attempt in range(2):
+        if _conn is None:
+            _conn = http.client.HTTPConnection(API_HOST, API_PORT, timeout=timeout)
+        try:
+            _conn.request('GET', path, headers=REQUEST_HEADERS)
+            response = _conn.getresponse()
+            body = response.read()
+            break
+        except (http.client.HTTPException, OSError):
+            # Server may have dropped the idle connection; reconnect once
+            _conn.close()
+            _conn = None
+            if attempt:
+                raise
+
+    if response.status != 200:
+        raise http.client.HTTPException(f"HTTP {response.status} {response.reason}")
+    if response.getheader('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return json_loads(body)
+
 def get_positions():
     try:
-        req = urllib.request.Request('http://localhost:8094/api/futures/ginie/autopilot/status')
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            return data
+        return _api_get(STATUS_PATH)
     except Exception as e:
         print(f"Error: {e}")
         return None
@@ -41,45 +74,38 @@ def show_positions():
     print()
 
     for pos in positions:
-        symbol = pos.get('symbol', 'N/A')
-        side = pos.get('side', 'N/A')
-        entry = pos.get('entry_price', 0)
-        current_tp = pos.get('current_tp_level', 0)
-        unrealized = pos.get('unrealized_pnl', 0)
-        realized = pos.get('realized_pnl', 0)
-        tps = pos.get('take_profits', [])
-        mode = pos.get('mode', 'N/A')
+        g = pos.get
+        symbol = g('symbol', 'N/A')
+        side = g('side', 'N/A')
+        entry = g('entry_price', 0)
+        current_tp = g('current_tp_level', 0)
+        unrealized = g('unrealized_pnl', 0)
+        realized = g('realized_pnl', 0)
+        tps = g('take_profits', [])
+        mode = g('mode', 'N/A')
 
         print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         print(f"{symbol:15} | {side:6} | {mode.upper():8} | Entry: ${entry:.8f}")
         print()
 
-        # TP Progression line
-        tp_line = "  TP Progress: "
+        # TP progression, prices and percentages, built in one pass over the levels
+        tp_line = ["  TP Progress: "]
+        tp_prices = ["  Prices:       "]
+        tp_pcts = ["  Allocation:   "]
         for tp in tps:
-            level = tp.get('level', 0)
-            status = tp.get('status', 'pending')
+            tg = tp.get
+            level, status, price, pct = tg('level', 0), tg('status', 'pending'), tg('price', 0), tg('percent', 0)
             if status == 'hit':
-                tp_line += f"[TP{level}✓] "
+                tp_line.append(f"[TP{level}✓] ")
             elif current_tp + 1 == level:
-                tp_line += f"[TP{level}⚠] "
+                tp_line.append(f"[TP{level}⚠] ")
             else:
-                tp_line += f"[TP{level}○] "
-        print(tp_line)
-
-        # TP prices
-        tp_prices = "  Prices:       "
-        for tp in tps:
-            price = tp.get('price', 0)
-            tp_prices += f"${price:.4f}  "
-        print(tp_prices)
-
-        # TP percentages
-        tp_pcts = "  Allocation:   "
-        for tp in tps:
-            pct = tp.get('percent', 0)
-            tp_pcts += f"{pct}%      "
-        print(tp_pcts)
+                tp_line.append(f"[TP{level}○] ")
+            tp_prices.append(f"${price:.4f}  ")
+            tp_pcts.append(f"{pct}%      ")
+        print(''.join(tp_line))
+        print(''.join(tp_prices))
+        print(''.join(tp_pcts))
         print()
 
         # Status